@@ -1,26 +1,97 @@
+import asyncio
+import hashlib
 import json
 import os
 import random
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
 import google.generativeai as genai
+import numpy as np
+import orjson
 from dotenv import load_dotenv
-from fastapi import Body, FastAPI, HTTPException
+from fastapi import BackgroundTasks, Body, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data"
 QUESTION_BANK_PATH = DATA_DIR / "questions.json"
-SESSIONS_PATH = DATA_DIR / "sessions.json"
+SESSIONS_DIR = DATA_DIR / "sessions"
+# Single-file store used before sessions were split into SESSIONS_DIR.
+LEGACY_SESSIONS_PATH = DATA_DIR / "sessions.json"
+EVALUATION_CACHE_DIR = DATA_DIR / "evaluation_cache"
+
+load_dotenv()
 
 DEFAULT_MODEL = os.environ.get("GEMINI_MODEL", "gemini-1.5-pro")
+EMBEDDING_MODEL = os.environ.get("GEMINI_EMBEDDING_MODEL", "models/text-embedding-004")
+# Cosine similarity above which two answers to the same question share an evaluation.
+SEMANTIC_CACHE_THRESHOLD = 0.92
+# Oldest entries are evicted once a (question, role) pair holds this many answers.
+SEMANTIC_CACHE_MAX_ENTRIES = 200
+# Number of independent judge samples per answer; scores are averaged across them.
+EVALUATION_JUDGES = max(1, int(os.environ.get("GEMINI_EVALUATION_JUDGES", "1")))
+GEMINI_MAX_CONCURRENCY = max(1, int(os.environ.get("GEMINI_MAX_CONCURRENCY", "4")))
+
+# Static part of the evaluation prompt. It is identical for every /answer call,
+# so it is sent once as the model's system instruction. It is far below Gemini's
+# minimum size for context caching, so no CachedContent is created for it.
+EVALUATION_SYSTEM_PROMPT = """
+You are an interview coach evaluating candidates' answers to interview questions.
 
+Scoring rubric (1-5, integers):
+- relevance: Addresses the question and key points.
+- structure: Clear organization, concise delivery, logical flow.
+- depth: Technical depth for technical questions; specificity/impact for behavioral.
+- communication: Clarity of language, avoids filler, confident tone.
 
-load_dotenv()
+Return ONLY valid JSON in this exact shape. No extra text.
+{
+  "scores": {
+    "relevance": 1-5,
+    "structure": 1-5,
+    "depth": 1-5,
+    "communication": 1-5
+  },
+  "feedback": [
+    "Bullet on what to improve or what went well"
+  ],
+  "suggested_answer": "A short, improved answer (2-5 sentences)"
+}
+"""
+
+# Per-call prompt: HEAD + job role + question block + candidate answer + TAIL.
+# Question blocks are pre-rendered per question by _render_question_blocks.
+EVALUATION_PROMPT_HEAD = "\nRole: "
+EVALUATION_PROMPT_TAIL = "\n"
+
+# Sessions are read from SESSIONS_DIR on first access, kept in memory for the
+# lifetime of the process and written back in the background after each mutation.
+SESSIONS: Dict[str, Any] = {}
+# One lock per session: writes to a session's file are ordered, but unrelated
+# sessions are written independently.
+_SESSION_LOCKS: Dict[str, asyncio.Lock] = {}
+_pending_session_writes: Set[str] = set()
+
+# Bounds in-flight Gemini calls (generate and embed) across all requests to stay
+# within Gemini RPM.
+_GEMINI_SEMAPHORE = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+
+_evaluation_model: Optional[genai.GenerativeModel] = None
+
+# Semantic cache of past evaluations: (question_id, job_role) -> {"vectors": (n, d)
+# array of unit-normalised answer embeddings, "evaluations": list of n evaluations}.
+# A hit hands one candidate's full evaluation, including feedback and suggested
+# answer, to another candidate with the same role. Use ?no_cache=1 to opt out.
+EVALUATION_CACHE: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_EVALUATION_CACHE_LOCK = asyncio.Lock()
+_dirty_cache_keys: Set[Tuple[str, str]] = set()
 
 
 class StartSessionRequest(BaseModel):
@@ -35,70 +106,228 @@ class AnswerRequest(BaseModel):
     user_answer_text: str
 
 
+class SessionStartResponse(BaseModel):
+    session_id: str
+    question: Optional[Dict[str, Any]] = None
+
+
+class AnswerResponse(BaseModel):
+    evaluation: Dict[str, Any]
+    next_question: Optional[Dict[str, Any]] = None
+
+
+class AnswerBatchResponse(BaseModel):
+    results: List[AnswerResponse]
+
+
+class SummaryResponse(BaseModel):
+    session_id: str
+    user_name: Optional[str] = None
+    job_role: Optional[str] = None
+    interview_type: Optional[str] = None
+    created_at: Optional[str] = None
+    total_questions: int
+    answered: int
+    scores_average: Dict[str, Optional[float]]
+    answers: List[Dict[str, Any]]
+
+
+SCORE_KEYS = ("relevance", "structure", "depth", "communication")
+
+
+def _score_or_nan(value: Any) -> float:
+    if not isinstance(value, (int, float)):
+        return np.nan
+    return float(value)
+
+
+def average_scores(answers: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    if not answers:
+        return {key: None for key in SCORE_KEYS}
+    flat = np.fromiter(
+        (
+            _score_or_nan(item.get("evaluation", {}).get("scores", {}).get(key))
+            for item in answers
+            for key in SCORE_KEYS
+        ),
+        dtype=np.float64,
+        count=len(answers) * len(SCORE_KEYS),
+    )
+    scores = flat.reshape(len(answers), len(SCORE_KEYS))
+    counts = np.count_nonzero(~np.isnan(scores), axis=0)
+    # nansum / count instead of nanmean so empty columns don't emit RuntimeWarnings.
+    means = np.nansum(scores, axis=0) / np.maximum(counts, 1)
+    return {
+        key: float(mean) if count else None
+        for key, mean, count in zip(SCORE_KEYS, means, counts)
+    }
+
+
+# Returned by /answer when Gemini fails or its output cannot be parsed.
+FALLBACK_EVALUATION: Dict[str, Any] = {
+    "scores": {
+        "relevance": 3,
+        "structure": 3,
+        "depth": 3,
+        "communication": 3,
+    },
+    "feedback": [
+        "LLM evaluation failed; returning default scores.",
+        "Gemini could not be reached or returned output that could not be parsed.",
+    ],
+    "suggested_answer": "Provide a clear, concise, and structured answer covering the key points.",
+}
+
+
+def model_response(model: BaseModel) -> ORJSONResponse:
+    return ORJSONResponse(model.model_dump(mode="json", exclude_none=True))
+
+
+def json_response(content: Dict[str, Any]) -> Response:
+    # For payloads assembled in-process and already JSON-safe: skips model
+    # validation and jsonable_encoder. None fields are dropped like model_response.
+    body = orjson.dumps(
+        {key: value for key, value in content.items() if value is not None},
+        option=orjson.OPT_NON_STR_KEYS,
+    )
+    return Response(content=body, media_type="application/json")
+
+
 def ensure_data_files() -> None:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     if not QUESTION_BANK_PATH.exists():
         raise FileNotFoundError(f"Question bank not found at {QUESTION_BANK_PATH}")
-    if not SESSIONS_PATH.exists():
-        SESSIONS_PATH.write_text("{}", encoding="utf-8")
+    SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def load_sessions() -> Dict[str, Any]:
-    ensure_data_files()
-    with open(SESSIONS_PATH, "r", encoding="utf-8") as f:
-        content = f.read().strip()
-        return json.loads(content) if content else {}
+def session_path(session_id: str) -> Optional[Path]:
+    # Session ids come straight from the client; only accept canonical UUIDs so
+    # they can never escape SESSIONS_DIR.
+    try:
+        canonical = str(uuid.UUID(session_id))
+    except ValueError:
+        return None
+    if canonical != session_id:
+        return None
+    return SESSIONS_DIR / f"{session_id}.json"
 
 
-def save_sessions(sessions: Dict[str, Any]) -> None:
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    with open(SESSIONS_PATH, "w", encoding="utf-8") as f:
-        json.dump(sessions, f, indent=2)
+def write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
 
 
-def load_question_bank() -> List[Dict[str, Any]]:
-    ensure_data_files()
-    with open(QUESTION_BANK_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+def load_session(session_id: str) -> Optional[Dict[str, Any]]:
+    path = session_path(session_id)
+    if path is None or not path.exists():
+        return None
+    return migrate_session(orjson.loads(path.read_bytes()))
 
 
-def pick_questions(bank: List[Dict[str, Any]], total: int = 10) -> List[Dict[str, Any]]:
-    shuffled = bank[:]
-    random.shuffle(shuffled)
-    return shuffled[:total]
+def save_session(session: Dict[str, Any]) -> None:
+    write_atomic(
+        SESSIONS_DIR / f"{session['session_id']}.json",
+        orjson.dumps(session, option=orjson.OPT_INDENT_2),
+    )
 
 
-def configure_gemini() -> None:
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="Missing GEMINI_API_KEY environment variable")
-    genai.configure(api_key=api_key)
+def get_session(session_id: str) -> Optional[Dict[str, Any]]:
+    session = SESSIONS.get(session_id)
+    if session is None:
+        session = load_session(session_id)
+        if session is not None:
+            # Runs in worker threads: if two requests load the same session at
+            # once, both must end up sharing whichever dict was stored first.
+            session = SESSIONS.setdefault(session_id, session)
+    return session
+
+
+def migrate_legacy_sessions() -> None:
+    if not LEGACY_SESSIONS_PATH.exists():
+        return
+    content = LEGACY_SESSIONS_PATH.read_bytes()
+    sessions = orjson.loads(content) if content.strip() else {}
+    for session in sessions.values():
+        save_session(migrate_session(session))
+    os.replace(LEGACY_SESSIONS_PATH, LEGACY_SESSIONS_PATH.with_suffix(".json.migrated"))
+
+
+async def persist_session(session_id: str) -> None:
+    # A write already waiting on the lock will snapshot the latest state,
+    # so bursts of mutations to one session collapse into a single write.
+    if session_id in _pending_session_writes:
+        return
+    _pending_session_writes.add(session_id)
+    async with _SESSION_LOCKS.setdefault(session_id, asyncio.Lock()):
+        _pending_session_writes.discard(session_id)
+        session = SESSIONS[session_id]
+        data = orjson.dumps(session, option=orjson.OPT_INDENT_2)
+        await asyncio.to_thread(write_atomic, SESSIONS_DIR / f"{session_id}.json", data)
+
+
+def _cache_file_stem(key: Tuple[str, str]) -> Path:
+    # Job roles are free text, so entries are stored under a hash of the key.
+    digest = hashlib.sha1("\0".join(key).encode("utf-8")).hexdigest()
+    return EVALUATION_CACHE_DIR / digest
+
+
+def load_evaluation_cache() -> Dict[Tuple[str, str], Dict[str, Any]]:
+    cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    if not EVALUATION_CACHE_DIR.exists():
+        return cache
+    for meta_path in EVALUATION_CACHE_DIR.glob("*.json"):
+        vectors_path = meta_path.with_suffix(".npy")
+        if not vectors_path.exists():
+            continue
+        meta = orjson.loads(meta_path.read_bytes())
+        vectors = np.load(vectors_path)
+        if len(vectors) != len(meta["evaluations"]):
+            continue
+        cache[(meta["question_id"], meta["job_role"])] = {
+            "vectors": vectors,
+            "evaluations": meta["evaluations"],
+        }
+    return cache
 
 
-def extract_json_block(text: str) -> str:
-    cleaned = text.strip()
-    if cleaned.startswith("```"):
-        cleaned = cleaned.strip("`")
-        if cleaned.startswith("json"):
-            cleaned = cleaned[4:]
-    return cleaned.strip()
+def save_cache_entry(key: Tuple[str, str], vectors: np.ndarray, meta: bytes) -> None:
+    stem = _cache_file_stem(key)
+    stem.parent.mkdir(parents=True, exist_ok=True)
+    tmp_vectors = stem.with_suffix(".npy.tmp")
+    with open(tmp_vectors, "wb") as f:
+        np.save(f, vectors)
+    os.replace(tmp_vectors, stem.with_suffix(".npy"))
+    write_atomic(stem.with_suffix(".json"), meta)
 
 
-def evaluate_answer(
-    question: Dict[str, Any], user_answer: str, job_role: str
-) -> Dict[str, Any]:
-    configure_gemini()
-    model = genai.GenerativeModel(DEFAULT_MODEL)
+async def persist_evaluation_cache() -> None:
+    # Only (question, role) entries changed since the last write are rewritten.
+    async with _EVALUATION_CACHE_LOCK:
+        while _dirty_cache_keys:
+            key = _dirty_cache_keys.pop()
+            entry = EVALUATION_CACHE[key]
+            meta = orjson.dumps(
+                {"question_id": key[0], "job_role": key[1], "evaluations": entry["evaluations"]}
+            )
+            await asyncio.to_thread(save_cache_entry, key, entry["vectors"], meta)
+
+
+@lru_cache(maxsize=1)
+def _read_question_bank(mtime_ns: int) -> List[Dict[str, Any]]:
+    # Keyed on mtime so edits to questions.json are picked up without a restart.
+    return orjson.loads(QUESTION_BANK_PATH.read_bytes())
 
-    criteria = [
-        "Relevance & completeness vs the question",
-        "Structure & clarity (organized, concise, logical flow)",
-        "Technical depth (for technical questions; for behavioral focus on specifics and impact)",
-        "Communication (tone, avoidance of filler, confidence)",
-    ]
 
-    prompt = f"""
-You are an interview coach evaluating a candidate for the role: {job_role}.
+@lru_cache(maxsize=1)
+def _index_question_bank(mtime_ns: int) -> Dict[str, Dict[str, Any]]:
+    return {question["id"]: question for question in _read_question_bank(mtime_ns)}
+
+
+def render_question_block(question: Dict[str, Any]) -> str:
+    return f"""
 
 Question:
 {question['question']}
@@ -109,40 +338,250 @@ Sample good points to look for:
 {json.dumps(question.get('sample_good_points', []), indent=2)}
 
 Candidate answer:
-{user_answer}
+"""
 
-Scoring rubric (1-5, integers):
-- relevance: Addresses the question and key points.
-- structure: Clear organization, concise delivery, logical flow.
-- depth: Technical depth for technical questions; specificity/impact for behavioral.
-- communication: Clarity of language, avoids filler, confident tone.
 
-Return ONLY valid JSON in this exact shape. No extra text.
-{{
-  "scores": {{
-    "relevance": 1-5,
-    "structure": 1-5,
-    "depth": 1-5,
-    "communication": 1-5
-  }},
-  "feedback": [
-    "Bullet on what to improve or what went well"
-  ],
-  "suggested_answer": "A short, improved answer (2-5 sentences)"
-}}
-"""
+@lru_cache(maxsize=1)
+def _render_question_blocks(mtime_ns: int) -> Dict[str, str]:
+    # Everything in the per-call prompt except role and answer depends only on
+    # the question, so render it once per bank load.
+    return {q["id"]: render_question_block(q) for q in _read_question_bank(mtime_ns)}
+
 
-    response = model.generate_content(prompt)
+def load_question_bank() -> List[Dict[str, Any]]:
+    ensure_data_files()
+    return _read_question_bank(QUESTION_BANK_PATH.stat().st_mtime_ns)
+
+
+def load_question_index() -> Dict[str, Dict[str, Any]]:
+    ensure_data_files()
+    return _index_question_bank(QUESTION_BANK_PATH.stat().st_mtime_ns)
+
+
+def load_question_prompt_blocks() -> Dict[str, str]:
+    ensure_data_files()
+    return _render_question_blocks(QUESTION_BANK_PATH.stat().st_mtime_ns)
+
+
+def migrate_session(session: Dict[str, Any]) -> Dict[str, Any]:
+    # Older sessions embedded full question payloads; keep only the ids and
+    # resolve questions against the bank on demand.
+    if "questions" in session:
+        session["question_ids"] = [q["id"] for q in session.pop("questions")]
+    return session
+
+
+def pick_questions(bank: List[Dict[str, Any]], total: int = 10) -> List[Dict[str, Any]]:
+    return random.sample(bank, min(total, len(bank)))
+
+
+def configure_gemini() -> None:
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("Missing GEMINI_API_KEY environment variable")
+    # The SDK keeps one client per service for the whole process; the async one
+    # uses gRPC, so concurrent evaluations are multiplexed over a single HTTP/2
+    # channel rather than opening a connection per request.
+    genai.configure(api_key=api_key)
+
+
+def extract_json_block(text: str) -> str:
+    # Return the first balanced {...} object, skipping braces inside string
+    # literals, so code fences or chatter around the JSON are ignored.
+    start = text.find("{")
+    if start == -1:
+        raise ValueError("No JSON object in LLM output")
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+    raise ValueError("Unterminated JSON object in LLM output")
+
+
+def get_evaluation_model() -> genai.GenerativeModel:
+    global _evaluation_model
+    if _evaluation_model is None:
+        _evaluation_model = genai.GenerativeModel(
+            DEFAULT_MODEL, system_instruction=EVALUATION_SYSTEM_PROMPT
+        )
+    return _evaluation_model
+
+
+def build_evaluation_prompt(question: Dict[str, Any], user_answer: str, job_role: str) -> str:
+    question_block = load_question_prompt_blocks().get(question["id"])
+    if question_block is None:
+        question_block = render_question_block(question)
+    return "".join(
+        (EVALUATION_PROMPT_HEAD, job_role, question_block, user_answer, EVALUATION_PROMPT_TAIL)
+    )
+
+
+async def evaluate_answer(prompt: str) -> Dict[str, Any]:
+    model = get_evaluation_model()
+
+    if EVALUATION_JUDGES == 1:
+        return await run_judge(model, prompt)
+
+    results = await asyncio.gather(
+        *[run_judge(model, prompt) for _ in range(EVALUATION_JUDGES)], return_exceptions=True
+    )
+    evaluations = [result for result in results if not isinstance(result, BaseException)]
+    if not evaluations:
+        raise results[0]
+    return merge_evaluations(evaluations)
+
+
+async def run_judge(model: genai.GenerativeModel, prompt: str) -> Dict[str, Any]:
+    async with _GEMINI_SEMAPHORE:
+        response = await model.generate_content_async(prompt)
     text = response.text if hasattr(response, "text") else str(response)
-    cleaned = extract_json_block(text)
+    # Malformed output raises ValueError, which /answer turns into the fallback evaluation.
+    return orjson.loads(extract_json_block(text))
+
+
+_STREAM_DONE = object()
+
+
+async def stream_judge(prompt: str) -> AsyncIterator[str]:
+    # A background task holds one Gemini slot for the whole life of the stream
+    # and drains it into an unbounded queue, so the slot is released as soon as
+    # Gemini finishes, however slowly the SSE client reads.
+    model = get_evaluation_model()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async with _GEMINI_SEMAPHORE:
+                response = await model.generate_content_async(prompt, stream=True)
+                async for chunk in response:
+                    queue.put_nowait(chunk.text)
+        except Exception as exc:
+            queue.put_nowait(exc)
+        else:
+            queue.put_nowait(_STREAM_DONE)
+
+    task = asyncio.create_task(pump())
     try:
-        parsed = json.loads(cleaned)
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=500, detail="LLM returned non-JSON output")
-    return parsed
+        while True:
+            item = await queue.get()
+            if item is _STREAM_DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Client went away mid-stream: stop reading from Gemini and free the slot.
+        task.cancel()
+
+
+def merge_evaluations(evaluations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    averages = average_scores([{"evaluation": evaluation} for evaluation in evaluations])
+    merged = dict(evaluations[0])
+    # Round half up; round() would send 2.5 to 2 but 3.5 to 4.
+    merged["scores"] = {
+        key: int(value + 0.5) for key, value in averages.items() if value is not None
+    }
+    return merged
+
+
+async def embed_answer(user_answer: str) -> np.ndarray:
+    async with _GEMINI_SEMAPHORE:
+        result = await genai.embed_content_async(model=EMBEDDING_MODEL, content=user_answer)
+    vector = np.asarray(result["embedding"], dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def lookup_cached_evaluation(
+    key: Tuple[str, str], vector: np.ndarray
+) -> Optional[Dict[str, Any]]:
+    entry = EVALUATION_CACHE.get(key)
+    if not entry:
+        return None
+    similarities = entry["vectors"] @ vector
+    best = int(np.argmax(similarities))
+    if similarities[best] < SEMANTIC_CACHE_THRESHOLD:
+        return None
+    return entry["evaluations"][best]
+
+
+def store_cached_evaluation(
+    key: Tuple[str, str], vector: np.ndarray, evaluation: Dict[str, Any]
+) -> None:
+    entry = EVALUATION_CACHE.get(key)
+    if entry is None:
+        EVALUATION_CACHE[key] = {
+            "vectors": vector[np.newaxis, :],
+            "evaluations": [evaluation],
+        }
+    else:
+        start = max(0, len(entry["evaluations"]) + 1 - SEMANTIC_CACHE_MAX_ENTRIES)
+        entry["vectors"] = np.vstack([entry["vectors"][start:], vector])
+        entry["evaluations"] = entry["evaluations"][start:] + [evaluation]
+    _dirty_cache_keys.add(key)
+
+
+async def semantic_cache_lookup(
+    key: Tuple[str, str], user_answer: str, use_cache: bool = True
+) -> Tuple[Optional[np.ndarray], Optional[Dict[str, Any]]]:
+    # Returns the answer embedding (for storing a fresh evaluation later) and
+    # the cached evaluation on a hit.
+    if not use_cache:
+        return None, None
+    try:
+        vector = await embed_answer(user_answer)
+    except Exception:
+        # The cache is an optimisation; never fail an evaluation because of it.
+        return None, None
+    return vector, lookup_cached_evaluation(key, vector)
 
 
-app = FastAPI(title="Interview Coach API", version="0.1.0")
+def settle_evaluation(
+    key: Tuple[str, str], vector: Optional[np.ndarray], evaluation: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    # evaluation is None when Gemini failed or its output could not be parsed;
+    # the route still responds with the fallback, which is never cached.
+    if evaluation is None:
+        return FALLBACK_EVALUATION
+    if vector is not None:
+        store_cached_evaluation(key, vector, evaluation)
+    return evaluation
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Fail fast on a missing API key instead of on the first /answer call.
+    configure_gemini()
+    get_evaluation_model()
+    ensure_data_files()
+    migrate_legacy_sessions()
+    EVALUATION_CACHE.update(load_evaluation_cache())
+    yield
+    await persist_evaluation_cache()
+
+
+app = FastAPI(
+    title="Interview Coach API",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -153,9 +592,10 @@ app.add_middleware(
 )
 
 
-@app.post("/start_session")
-def start_session(payload: StartSessionRequest = Body(...)) -> Dict[str, Any]:
-    sessions = load_sessions()
+@app.post("/start_session", response_model=SessionStartResponse)
+def start_session(
+    background_tasks: BackgroundTasks, payload: StartSessionRequest = Body(...)
+) -> Response:
     bank = load_question_bank()
     questions = pick_questions(bank, total=10)
 
@@ -166,58 +606,63 @@ def start_session(payload: StartSessionRequest = Body(...)) -> Dict[str, Any]:
         "job_role": payload.job_role,
         "interview_type": payload.interview_type,
         "created_at": datetime.utcnow().isoformat() + "Z",
-        "questions": questions,
+        "question_ids": [q["id"] for q in questions],
         "current_index": 0,
         "answers": [],
     }
 
-    sessions[session_id] = session
-    save_sessions(sessions)
+    SESSIONS[session_id] = session
+    background_tasks.add_task(persist_session, session_id)
 
     first_question = questions[0] if questions else None
-    return {"session_id": session_id, "question": first_question}
+    return json_response({"session_id": session_id, "question": first_question})
 
 
-@app.post("/answer")
-def answer(payload: AnswerRequest = Body(...)) -> Dict[str, Any]:
-    sessions = load_sessions()
-    session = sessions.get(payload.session_id)
+def prepare_answer(
+    payload: AnswerRequest, offset: int = 0
+) -> Tuple[Dict[str, Any], Dict[str, Any], str]:
+    # Runs in a worker thread, so the bank lookups (and their stat calls) and the
+    # prompt build stay off the event loop.
+    # offset: answers to the same session queued ahead of this one in a batch.
+    session = get_session(payload.session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    idx = session.get("current_index", 0)
-    questions = session.get("questions", [])
-    if idx >= len(questions):
+    idx = session.get("current_index", 0) + offset
+    question_ids = session.get("question_ids", [])
+    if idx >= len(question_ids):
         raise HTTPException(status_code=400, detail="Session already completed")
 
-    current_question = questions[idx]
+    current_question = load_question_index().get(question_ids[idx])
+    if current_question is None:
+        raise HTTPException(status_code=404, detail="Question no longer in the question bank")
     if current_question["id"] != payload.question_id:
         raise HTTPException(status_code=400, detail="Question does not match the session state")
-
-    try:
-        evaluation = evaluate_answer(
-            question=current_question,
-            user_answer=payload.user_answer_text,
-            job_role=session.get("job_role", "SDE Intern"),
-        )
-    except HTTPException:
-        # Bubble up known HTTP errors (e.g., missing GEMINI_API_KEY)
-        raise
-    except Exception:
-        # Fallback evaluation so the route still responds even if LLM fails.
-        evaluation = {
-            "scores": {
-                "relevance": 3,
-                "structure": 3,
-                "depth": 3,
-                "communication": 3,
-            },
-            "feedback": [
-                "LLM evaluation failed; returning default scores.",
-                "Ensure GEMINI_API_KEY is set and backend can reach Gemini.",
-            ],
-            "suggested_answer": "Provide a clear, concise, and structured answer covering the key points.",
-        }
+    prompt = build_evaluation_prompt(
+        current_question, payload.user_answer_text, session.get("job_role", "SDE Intern")
+    )
+    return session, current_question, prompt
+
+
+def check_answer_position(
+    session: Dict[str, Any], current_question: Dict[str, Any], offset: int = 0
+) -> None:
+    idx = session.get("current_index", 0) + offset
+    question_ids = session.get("question_ids", [])
+    if idx >= len(question_ids) or question_ids[idx] != current_question["id"]:
+        # Another request for this session was scored while we were awaiting Gemini.
+        raise HTTPException(status_code=409, detail="Question was already answered")
+
+
+def record_answer(
+    session: Dict[str, Any],
+    current_question: Dict[str, Any],
+    payload: AnswerRequest,
+    evaluation: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    check_answer_position(session, current_question)
+    idx = session.get("current_index", 0)
+    question_ids = session.get("question_ids", [])
 
     session["answers"].append(
         {
@@ -229,50 +674,179 @@ def answer(payload: AnswerRequest = Body(...)) -> Dict[str, Any]:
     )
     session["current_index"] = idx + 1
 
-    next_question: Optional[Dict[str, Any]] = None
-    if session["current_index"] < len(questions):
-        next_question = questions[session["current_index"]]
+    if session["current_index"] < len(question_ids):
+        return load_question_index().get(question_ids[session["current_index"]])
+    return None
+
+
+def prepare_answer_batch(
+    payloads: List[AnswerRequest],
+) -> List[Tuple[Dict[str, Any], Dict[str, Any], str]]:
+    offsets: Dict[str, int] = {}
+    prepared = []
+    for payload in payloads:
+        offset = offsets.get(payload.session_id, 0)
+        prepared.append(prepare_answer(payload, offset))
+        offsets[payload.session_id] = offset + 1
+    return prepared
+
+
+async def evaluate_with_fallback(
+    question: Dict[str, Any],
+    user_answer: str,
+    job_role: str,
+    prompt: str,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    key = (question["id"], job_role)
+    vector, cached = await semantic_cache_lookup(key, user_answer, use_cache)
+    if cached is not None:
+        return cached
+    try:
+        evaluation: Optional[Dict[str, Any]] = await evaluate_answer(prompt)
+    except Exception:
+        evaluation = None
+    return settle_evaluation(key, vector, evaluation)
+
 
-    sessions[payload.session_id] = session
-    save_sessions(sessions)
+def sse_event(event: str, data: Dict[str, Any]) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
 
-    return {"evaluation": evaluation, "next_question": next_question}
 
+@app.post("/answer", response_model=AnswerResponse)
+async def answer(
+    background_tasks: BackgroundTasks,
+    payload: AnswerRequest = Body(...),
+    no_cache: bool = False,
+) -> ORJSONResponse:
+    session, current_question, prompt = await asyncio.to_thread(prepare_answer, payload)
 
-@app.get("/summary/{session_id}")
-def summary(session_id: str) -> Dict[str, Any]:
-    sessions = load_sessions()
-    session = sessions.get(session_id)
+    evaluation = await evaluate_with_fallback(
+        question=current_question,
+        user_answer=payload.user_answer_text,
+        job_role=session.get("job_role", "SDE Intern"),
+        prompt=prompt,
+        use_cache=not no_cache,
+    )
+    next_question = record_answer(session, current_question, payload, evaluation)
+
+    background_tasks.add_task(persist_session, payload.session_id)
+    background_tasks.add_task(persist_evaluation_cache)
+
+    return model_response(AnswerResponse(evaluation=evaluation, next_question=next_question))
+
+
+@app.post("/answer_batch", response_model=AnswerBatchResponse)
+async def answer_batch(
+    background_tasks: BackgroundTasks,
+    payloads: List[AnswerRequest] = Body(...),
+    no_cache: bool = False,
+) -> ORJSONResponse:
+    # Validates the whole batch up front, evaluates every answer concurrently
+    # (bounded by the shared Gemini semaphore), then records them in order.
+    prepared = await asyncio.to_thread(prepare_answer_batch, payloads)
+    evaluations = await asyncio.gather(
+        *[
+            evaluate_with_fallback(
+                question=current_question,
+                user_answer=payload.user_answer_text,
+                job_role=session.get("job_role", "SDE Intern"),
+                prompt=prompt,
+                use_cache=not no_cache,
+            )
+            for payload, (session, current_question, prompt) in zip(payloads, prepared)
+        ]
+    )
+
+    # Re-check the whole batch before mutating anything so a 409 never leaves it
+    # half recorded. Nothing awaits between this check and the writes below.
+    offsets: Dict[str, int] = {}
+    for payload, (session, current_question, _) in zip(payloads, prepared):
+        offset = offsets.get(payload.session_id, 0)
+        check_answer_position(session, current_question, offset)
+        offsets[payload.session_id] = offset + 1
+
+    results = []
+    for payload, (session, current_question, _), evaluation in zip(
+        payloads, prepared, evaluations
+    ):
+        next_question = record_answer(session, current_question, payload, evaluation)
+        results.append(AnswerResponse(evaluation=evaluation, next_question=next_question))
+
+    for session_id in dict.fromkeys(payload.session_id for payload in payloads):
+        background_tasks.add_task(persist_session, session_id)
+    background_tasks.add_task(persist_evaluation_cache)
+
+    return model_response(AnswerBatchResponse(results=results))
+
+
+@app.post("/answer/stream")
+async def answer_stream(
+    background_tasks: BackgroundTasks,
+    payload: AnswerRequest = Body(...),
+    no_cache: bool = False,
+) -> StreamingResponse:
+    session, current_question, prompt = await asyncio.to_thread(prepare_answer, payload)
+    job_role = session.get("job_role", "SDE Intern")
+
+    async def events() -> AsyncIterator[bytes]:
+        # Emits "chunk" events with raw model text as it arrives, then a single
+        # "result" event shaped like the /answer response once it has been parsed.
+        # Cache hits and multi-judge evaluations have nothing to stream and go
+        # straight to "result".
+        if EVALUATION_JUDGES > 1:
+            evaluation = await evaluate_with_fallback(
+                current_question, payload.user_answer_text, job_role, prompt, not no_cache
+            )
+        else:
+            key = (current_question["id"], job_role)
+            vector, evaluation = await semantic_cache_lookup(
+                key, payload.user_answer_text, not no_cache
+            )
+            if evaluation is None:
+                chunks: List[str] = []
+                try:
+                    async for text in stream_judge(prompt):
+                        chunks.append(text)
+                        yield sse_event("chunk", {"text": text})
+                    parsed: Optional[Dict[str, Any]] = orjson.loads(
+                        extract_json_block("".join(chunks))
+                    )
+                except Exception:
+                    parsed = None
+                evaluation = settle_evaluation(key, vector, parsed)
+
+        try:
+            next_question = record_answer(session, current_question, payload, evaluation)
+        except HTTPException as exc:
+            yield sse_event("error", {"detail": exc.detail})
+            return
+        yield sse_event("result", {"evaluation": evaluation, "next_question": next_question})
+
+    background_tasks.add_task(persist_session, payload.session_id)
+    background_tasks.add_task(persist_evaluation_cache)
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/summary/{session_id}", response_model=SummaryResponse)
+def summary(session_id: str) -> Response:
+    session = get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
     answers = session.get("answers", [])
-    score_totals: Dict[str, List[int]] = {
-        "relevance": [],
-        "structure": [],
-        "depth": [],
-        "communication": [],
-    }
+    averages = average_scores(answers)
 
-    for item in answers:
-        scores = item.get("evaluation", {}).get("scores", {})
-        for key in score_totals:
-            val = scores.get(key)
-            if isinstance(val, (int, float)):
-                score_totals[key].append(val)
-
-    averages = {
-        key: (sum(vals) / len(vals)) if vals else None for key, vals in score_totals.items()
-    }
-
-    return {
-        "session_id": session_id,
-        "user_name": session.get("user_name"),
-        "job_role": session.get("job_role"),
-        "interview_type": session.get("interview_type"),
-        "created_at": session.get("created_at"),
-        "total_questions": len(session.get("questions", [])),
-        "answered": len(answers),
-        "scores_average": averages,
-        "answers": answers,
-    }
+    return json_response(
+        {
+            "session_id": session_id,
+            "user_name": session.get("user_name"),
+            "job_role": session.get("job_role"),
+            "interview_type": session.get("interview_type"),
+            "created_at": session.get("created_at"),
+            "total_questions": len(session.get("question_ids", [])),
+            "answered": len(answers),
+            "scores_average": averages,
+            "answers": answers,
+        }
+    )